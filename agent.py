@@ -1,62 +1,102 @@
 import os
+import string
+import time
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 from dotenv import load_dotenv
 import httpx
+import orjson
 
 from livekit import agents
-from livekit.agents import AgentSession, Agent, JobContext, function_tool
+from livekit.agents import AgentSession, Agent, JobContext, function_tool, tokenize
+from livekit.agents import tts as agent_tts
 from livekit.plugins import openai, silero
 # Add noise cancellation import
 from livekit.plugins import noise_cancellation
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] INTERVIEW_AGENT: %(message)s")
+logger = logging.getLogger(__name__)
 
 MCP_PORT = int(os.getenv("MCP_PORT", "8000"))
 MCP_HOST = os.getenv("MCP_HOST", "http://localhost")
 MCP_SERVER_URL = "https://mcp-server-qvqr.onrender.com/mcp"
+MAX_USER_TURN_SECONDS = float(os.getenv("MAX_USER_TURN_SECONDS", "15"))
+
+def _new_http_client() -> httpx.AsyncClient:
+    """Build the pooled HTTP client shared by every MCP call in a job."""
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(connect=5.0, read=20.0, write=20.0, pool=5.0),
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0),
+    )
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
 class MCPHTTPClient:
-    def __init__(self, url: str):
+    def __init__(self, url: str, http: httpx.AsyncClient | None = None):
         self.url = url
-        self.http: httpx.AsyncClient | None = None
+        self.http: httpx.AsyncClient | None = http
+        self._owns_http = http is None
         self.req_id = 0
 
     async def __aenter__(self):
-        self.http = httpx.AsyncClient(timeout=20.0)
+        if self.http is None:
+            self.http = _new_http_client()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        if self.http: await self.http.aclose()
+        if self.http and self._owns_http: await self.http.aclose()
 
     async def _rpc(self, method: str, params: Any = None) -> Any:
         if not self.http: raise ConnectionError("HTTP client not initialized.")
         self.req_id += 1
         payload = {"jsonrpc": "2.0", "id": self.req_id, "method": method, "params": params}
-        resp = await self.http.post(self.url, json=payload)
+        resp = await self.http.post(self.url, content=orjson.dumps(payload), headers=_JSON_HEADERS)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
         if "error" in data and data["error"]:
             raise RuntimeError(f"MCP error {data['error'].get('code')}: {data['error'].get('message')}")
         return data.get("result")
 
+    async def batch(self, calls: List[Tuple[str, Any]]) -> List[Any]:
+        """Send several JSON-RPC calls in one POST and return results in call order."""
+        if not self.http: raise ConnectionError("HTTP client not initialized.")
+        payload = []
+        for method, params in calls:
+            self.req_id += 1
+            payload.append({"jsonrpc": "2.0", "id": self.req_id, "method": method, "params": params})
+        resp = await self.http.post(self.url, content=orjson.dumps(payload), headers=_JSON_HEADERS)
+        resp.raise_for_status()
+        by_id = {item.get("id"): item for item in orjson.loads(resp.content)}
+        results = []
+        for req in payload:
+            data = by_id.get(req["id"])
+            if data is None:
+                raise RuntimeError(f"MCP batch response missing id {req['id']}")
+            if "error" in data and data["error"]:
+                raise RuntimeError(f"MCP error {data['error'].get('code')}: {data['error'].get('message')}")
+            results.append(data.get("result"))
+        return results
+
     async def call_tool(self, name: str, arguments: Dict[str, Any]):
         return await self._rpc("call_tool", {"name": name, "arguments": arguments or {}})
 
-class InterviewAgent(Agent):
-    def __init__(self, room_name: str = None):
-        super().__init__(
-            instructions = f"""
+    async def call_tools(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        return await self.batch([("call_tool", {"name": n, "arguments": a or {}}) for n, a in calls])
+
+# Kept byte-identical across rooms except the trailing room slot so the
+# LLM provider's prompt-prefix cache can be reused between interviews.
+_ORION_PROMPT = string.Template("""
 # Role
 You are "Orion", a professional AI interviewer. You conduct structured interviews and provide fair evaluations.
 
 # CRITICAL AUTOMATIC STARTUP
-You are joining room: {room_name if room_name else '[ROOM_NAME]'}
+Your room name is given in the "Room" section at the end of these instructions.
 
 IMMEDIATELY when you start:
-1. Call `fetch_interview_context` with room name: {room_name if room_name else '[ROOM_NAME]'}
+1. Call `fetch_interview_context` with that room name
 2. Once context is loaded successfully, begin the interview automatically
 3. If context loading fails, ask candidate to confirm the room name and try again
 
@@ -110,58 +150,84 @@ When interview concludes, call `finish_and_email_transcript` with complete trans
 
 # STARTUP BEHAVIOR
 Start immediately by calling fetch_interview_context, then begin the interview flow automatically.
-"""
+
+# Room
+You are joining room: $ROOM_NAME
+""")
+
+class InterviewAgent(Agent):
+    def __init__(self, room_name: str = None, *, http: httpx.AsyncClient):
+        super().__init__(
+            instructions=_ORION_PROMPT.substitute(ROOM_NAME=room_name or "[ROOM_NAME]")
         )
         self._mcp_url = MCP_SERVER_URL
+        # Long-lived client owned by the job (entrypoint closes it on shutdown),
+        # so sockets/TLS sessions are reused across tool calls
+        self._http = http
+        self._mcp = MCPHTTPClient(self._mcp_url, http=self._http)
         self._interview_context = None
+        self._context_view: Tuple[Tuple[Any, Any], str] | None = None
         self._transcript_log = []
         self._room_name = room_name
         self._context_loaded = False
+        self._user_turn_started: float | None = None
 
     async def _call_mcp(self, tool_name: str, arguments: Dict[str, Any]):
         try:
-            async with MCPHTTPClient(self._mcp_url) as mcp:
-                return await mcp.call_tool(tool_name, arguments)
+            return await self._mcp.call_tool(tool_name, arguments)
         except Exception as e:
-            logging.error(f"MCP call failed for {tool_name}: {e}")
+            logger.error("MCP call failed for %s: %s", tool_name, e)
             return None
 
     @function_tool()
     async def fetch_interview_context(self, room_name: str) -> str:
         """Get current interview context (candidate info, JD, resume text)."""
-        logging.info(f"Fetching context for room: {room_name}")
+        logger.info("Fetching context for room: %s", room_name)
         result = await self._call_mcp("fetch_interview_context", {"room_name": room_name})
         
         if not result:
             return f"No interview context found for room '{room_name}'. Please ensure the candidate has filled out the form and the room name matches."
         
+        # Reuse the rendered view if the LLM re-asks for the same context
+        cache_key = (result.get("room_name"), result.get("created_at"))
+        if self._context_view and self._context_view[0] == cache_key:
+            return self._context_view[1]
+
         # Store context for later use
         self._interview_context = result
         self._context_loaded = True
         
+        jd = result.get("job_description", "") or ""
+        rt = result.get("resume_text", "") or ""
+        jd_short = jd[:500] + ("..." if len(jd) > 500 else "")
+        rt_short = rt[:500] + ("..." if len(rt) > 500 else "")
+        name = result.get("name")
+
         # Provide a compact view for the LLM
         view = [
             f"✅ INTERVIEW CONTEXT LOADED",
             f"Room: {result.get('room_name')}",
-            f"Candidate: {result.get('name')} <{result.get('email')}>",
+            f"Candidate: {name} <{result.get('email')}>",
             f"Phone: {result.get('phone', 'Not provided')}",
             f"Job Title: {result.get('job_title')}",
-            f"Job Description: {result.get('job_description')[:500]}{'...' if len(result.get('job_description', '')) > 500 else ''}",
+            f"Job Description: {jd_short}",
             f"Resume Summary (first 500 chars):",
-            result.get('resume_text', '')[:500] + ('...' if len(result.get('resume_text', '')) > 500 else ''),
+            rt_short,
             "",
             "🎯 CONTEXT LOADED SUCCESSFULLY - NOW BEGIN THE INTERVIEW:",
             "1. Introduce yourself as Orion",
-            f"2. Confirm you're speaking with {result.get('name')}",
+            f"2. Confirm you're speaking with {name}",
             "3. Ask for recording consent",
             "4. Then proceed with the structured interview"
         ]
-        return "\n".join(view)
+        rendered = "\n".join(view)
+        self._context_view = (cache_key, rendered)
+        return rendered
 
     @function_tool()
     async def finish_and_email_transcript(self, room_name: str, transcript: str, scorecard: str = "", notes: str = "") -> str:
         """Send transcript to candidate & HR via Gmail MCP tool through MCP server."""
-        logging.info(f"Finishing interview for room: {room_name}")
+        logger.info("Finishing interview for room: %s", room_name)
         
         result = await self._call_mcp("finish_and_email_transcript", {
             "room_name": room_name, 
@@ -183,33 +249,57 @@ Start immediately by calling fetch_interview_context, then begin the interview f
         """Log user messages for transcript"""
         self._transcript_log.append(f"Candidate: {message}")
 
+    def on_user_state_changed(self, event):
+        """Log unusually long continuous speaking spans so latency regressions are visible"""
+        if event.new_state == "speaking":
+            self._user_turn_started = time.monotonic()
+        elif event.old_state == "speaking" and self._user_turn_started is not None:
+            duration = time.monotonic() - self._user_turn_started
+            self._user_turn_started = None
+            if duration > MAX_USER_TURN_SECONDS:
+                logger.warning("⚠️ Candidate spoke for %.1fs without a VAD pause (threshold %.0fs)", duration, MAX_USER_TURN_SECONDS)
+
 async def entrypoint(ctx: JobContext):
-    logging.info(f"🚀 Agent starting for room: {ctx.room.name}")
+    logger.info("🚀 Agent starting for room: %s", ctx.room.name)
     await ctx.connect()
     
     # Enhanced session configuration with noise cancellation
     session = AgentSession(
+        # Realtime transcription streams partial transcripts while the candidate is
+        # still speaking, instead of batch Whisper waiting for the full utterance
         stt=openai.STT(
-            model="whisper-1", 
+            model="gpt-4o-transcribe",
+            use_realtime=True,
             prompt="You are transcribing a professional job interview. Use speaker tags 'Candidate:' and 'Interviewer:'. Format dates as YYYY-MM-DD and times as HH:MM. Be accurate with technical terms and company names."
         ),
         llm=openai.LLM(
             model="gpt-4o-mini",
             temperature=0.7,  # Slightly more conversational
         ),
-        tts=openai.TTS(
-            model="tts-1",
-            voice="nova"  # Professional, clear voice
+        # The session already splits LLM output into sentences for non-streaming TTS,
+        # but the default tokenizer holds back sentences under 20 chars. A lower
+        # minimum lets short openers ("Hi, I'm Orion.") go to TTS right away.
+        tts=agent_tts.StreamAdapter(
+            tts=openai.TTS(
+                model="tts-1",
+                voice="nova"  # Professional, clear voice
+            ),
+            sentence_tokenizer=tokenize.basic.SentenceTokenizer(min_sentence_len=8),
         ),
         vad=silero.VAD.load(),
     )
     
+    # One pooled HTTP client per job, closed when the job shuts down
+    http = _new_http_client()
+    ctx.add_shutdown_callback(http.aclose)
+
     # Pass room name to agent
-    agent = InterviewAgent(room_name=ctx.room.name)
+    agent = InterviewAgent(room_name=ctx.room.name, http=http)
     
     # Add event listeners for transcript logging (synchronous callbacks)
     session.on("agent_speech_committed", agent.on_agent_speech_committed)
     session.on("user_speech_committed", agent.on_user_speech_committed)
+    session.on("user_state_changed", agent.on_user_state_changed)
     
     # Start session with noise cancellation enabled
     try:
@@ -220,26 +310,26 @@ async def entrypoint(ctx: JobContext):
             # BVC removes background noise AND background voices for better STT accuracy
             noise_cancellation=noise_cancellation.BVC()
         )
-        logging.info("✅ Agent session started successfully with noise cancellation enabled")
-        logging.info("🔊 Background Voice Cancellation (BVC) is active for optimal audio quality")
+        logger.info("✅ Agent session started successfully with noise cancellation enabled")
+        logger.info("🔊 Background Voice Cancellation (BVC) is active for optimal audio quality")
     except Exception as e:
-        logging.warning(f"⚠️ Failed to start with noise cancellation: {e}")
-        logging.info("🔄 Falling back to session without noise cancellation")
+        logger.warning("⚠️ Failed to start with noise cancellation: %s", e)
+        logger.info("🔄 Falling back to session without noise cancellation")
         # Fallback without noise cancellation if it fails
         await session.start(
             room=ctx.room, 
             agent=agent
         )
-        logging.info("✅ Agent session started successfully (without noise cancellation)")
+        logger.info("✅ Agent session started successfully (without noise cancellation)")
     
     # Pre-check if context exists for this room (for logging purposes)
     try:
         room_name = ctx.room.name
-        logging.info(f"📋 Room started: {room_name}")
-        logging.info("💡 Agent will automatically fetch context and begin interview")
+        logger.info("📋 Room started: %s", room_name)
+        logger.info("💡 Agent will automatically fetch context and begin interview")
             
     except Exception as e:
-        logging.error(f"❌ Error in entrypoint setup: {e}")
+        logger.error("❌ Error in entrypoint setup: %s", e)
 
 if __name__ == "__main__":
     agents.cli.run_app(agents.WorkerOptions(entrypoint_fnc=entrypoint))
\ No newline at end of file
@@ -0,0 +1,18 @@
+import hashlib
+from typing import Any, Optional
+
+import orjson
+
+
+def etag(payload: Any) -> str:
+    """Strong ETag for a JSON-serializable payload (hash of its canonical encoding)."""
+    canonical = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return f'"{hashlib.blake2b(canonical, digest_size=8).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], current: str) -> bool:
+    """True if an If-None-Match header value matches the current ETag."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or current in tags
@@ -1,17 +1,31 @@
 import os
-import io
+import base64
+import shutil
+import tempfile
+import time
+import orjson
+import zstandard as zstd
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
-from fastapi import FastAPI, Request, UploadFile, File, Form, HTTPException
-from fastapi.responses import JSONResponse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, List, Tuple, Protocol
+from cachetools import TTLCache
+from fastapi import FastAPI, Request, Response, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
 from pdfminer.high_level import extract_text
 from docx import Document
 from datetime import datetime
 
+from http_cache import etag, etag_matches
+
 load_dotenv()
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] MCP_INTERVIEW: %(message)s")
+logger = logging.getLogger(__name__)
 
 # Composio (optional for Gmail)
 try:
@@ -19,30 +33,173 @@ try:
 except Exception:
     Composio = None
 
+# Redis (optional, shared context store for multi-worker deployments)
+try:
+    import redis.asyncio as aioredis
+except Exception:
+    aioredis = None
+
 COMPOSIO_API_KEY = os.getenv("COMPOSIO_API_KEY", "")
 CONNECTED_ACCOUNT_ID_GMAIL = os.getenv("CONNECTED_ACCOUNT_ID_GMAIL", "")
 HR_EMAIL = os.getenv("HR_EMAIL", "hr@example.com")
 MCP_PORT = int(os.getenv("MCP_PORT", "8000"))
 ALLOW_ORIGINS = os.getenv("MCP_CORS_ORIGINS", "*")
-
-composio = None
-if Composio and COMPOSIO_API_KEY:
+MAX_RESUME_CHARS = 200_000
+UPLOAD_CHUNK_SIZE = 1 << 20
+MAX_REQUEST_BYTES = int(os.getenv("MAX_REQUEST_BYTES", str(10 << 20)))
+# Per uvicorn worker; keep (uvicorn workers x this) at or below the core count
+RESUME_PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", "2"))
+REDIS_URL = os.getenv("REDIS_URL", "")
+CONTEXT_TTL_SECONDS = int(os.getenv("CONTEXT_TTL_SECONDS", "86400"))
+CONTEXT_MAX_ROOMS = int(os.getenv("CONTEXT_MAX_ROOMS", "10000"))
+
+def _init_composio():
+    """Create the shared Composio client, or None when Gmail sends should be mocked."""
+    if not (Composio and COMPOSIO_API_KEY):
+        logger.warning("⚠️ Composio not configured — Gmail sends will be mocked.")
+        return None
     try:
-        composio = Composio(api_key=COMPOSIO_API_KEY)
-        logging.info("✅ Composio initialized for Gmail integration.")
+        client = Composio(api_key=COMPOSIO_API_KEY)
+        logger.info("✅ Composio initialized for Gmail integration.")
+        return client
     except Exception as e:
-        logging.error(f"❌ Composio init error: {e}")
-else:
-    logging.warning("⚠️ Composio not configured — Gmail sends will be mocked.")
+        logger.error("❌ Composio init error: %s", e)
+        return None
+
+# Resume text is kept zstd-compressed in the context store and only
+# decompressed when a tool or email actually needs it
+_CCTX = zstd.ZstdCompressor(level=3)
+_DCTX = zstd.ZstdDecompressor()
+
+def _compress_resume(text: str) -> bytes:
+    return _CCTX.compress(text.encode("utf-8")) if text else b""
+
+def _decompress_resume(blob: bytes) -> str:
+    return _DCTX.decompress(blob).decode("utf-8") if blob else ""
+
+# CPU-bound resume parsing runs in worker processes so it never stalls the event loop
+# Workers are spawned rather than forked: the server process already runs an
+# event loop and worker threads, which are unsafe to fork.
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=RESUME_PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pdf_pool
+
+def _reset_pdf_pool() -> None:
+    """Drop a broken pool (e.g. a worker OOM-killed on a hostile PDF) so the next upload gets a fresh one."""
+    global _pdf_pool
+    if _pdf_pool is not None:
+        pool, _pdf_pool = _pdf_pool, None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+class ContextStore(Protocol):
+    """Storage for interview context keyed by room name."""
+
+    async def get(self, room: str) -> Optional[Dict[str, Any]]: ...
+    async def set(self, room: str, context: Dict[str, Any]) -> None: ...
+    async def items(self) -> List[Tuple[str, Dict[str, Any]]]: ...
+    async def count(self) -> int: ...
+    async def close(self) -> None: ...
+
+class MemoryContextStore:
+    """Process-local store; bounded in size and entries expire after the TTL."""
+
+    def __init__(self, maxsize: int, ttl: int):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, room: str) -> Optional[Dict[str, Any]]:
+        return self._cache.get(room)
+
+    async def set(self, room: str, context: Dict[str, Any]) -> None:
+        self._cache[room] = context
+
+    async def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        return list(self._cache.items())
+
+    async def count(self) -> int:
+        return len(self._cache)
+
+    async def close(self) -> None:
+        pass
+
+class RedisContextStore:
+    """Redis-backed store so every uvicorn worker sees the same rooms."""
+
+    prefix = "interview:context:"
+
+    # How long count() may reuse a prefix SCAN, so / and /health don't scan per hit
+    count_cache_seconds = 5.0
 
-# In-memory store for context by room
-room_context: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, url: str, ttl: int):
+        self._redis = aioredis.from_url(url, decode_responses=True)
+        self._ttl = ttl
+        self._count_cache: Optional[Tuple[float, int]] = None
 
-def _send_gmail(to_email: str, subject: str, body: str) -> Dict[str, Any]:
+    @staticmethod
+    def _dumps(context: Dict[str, Any]) -> bytes:
+        # JSON has no bytes type, so the compressed resume travels as base64
+        resume = base64.b64encode(context.get("resume_text", b"")).decode("ascii")
+        return orjson.dumps({**context, "resume_text": resume})
+
+    @staticmethod
+    def _loads(raw: str) -> Dict[str, Any]:
+        context = orjson.loads(raw)
+        context["resume_text"] = base64.b64decode(context.get("resume_text", ""))
+        return context
+
+    async def get(self, room: str) -> Optional[Dict[str, Any]]:
+        raw = await self._redis.get(self.prefix + room)
+        return self._loads(raw) if raw else None
+
+    async def set(self, room: str, context: Dict[str, Any]) -> None:
+        await self._redis.set(self.prefix + room, self._dumps(context), ex=self._ttl)
+
+    async def _keys(self) -> List[str]:
+        keys = [key async for key in self._redis.scan_iter(match=self.prefix + "*")]
+        self._count_cache = (time.monotonic() + self.count_cache_seconds, len(keys))
+        return keys
+
+    async def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        keys = await self._keys()
+        if not keys:
+            return []
+        values = await self._redis.mget(keys)
+        return [
+            (key[len(self.prefix):], self._loads(raw))
+            for key, raw in zip(keys, values) if raw
+        ]
+
+    async def count(self) -> int:
+        # Counts the same prefixed keys /rooms lists, via a briefly cached SCAN
+        cached = self._count_cache
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        return len(await self._keys())
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+# Context store by room
+room_context: ContextStore
+if REDIS_URL and aioredis:
+    room_context = RedisContextStore(REDIS_URL, ttl=CONTEXT_TTL_SECONDS)
+    logger.info("✅ Using Redis for interview context storage.")
+else:
+    if REDIS_URL:
+        logger.warning("⚠️ REDIS_URL set but redis package missing — using in-memory context store.")
+    room_context = MemoryContextStore(maxsize=CONTEXT_MAX_ROOMS, ttl=CONTEXT_TTL_SECONDS)
+
+def _send_gmail(composio, to_email: str, subject: str, body: str) -> Dict[str, Any]:
     """Send email through composio Gmail tool or return a mock response."""
     if not composio or not CONNECTED_ACCOUNT_ID_GMAIL:
-        logging.info(f"[MOCK-EMAIL] to={to_email} | subject={subject}")
-        logging.info(f"[MOCK-BODY] {body[:200]}...")
+        logger.info("[MOCK-EMAIL] to=%s | subject=%s", to_email, subject)
+        logger.info("[MOCK-BODY] %s...", body[:200])
         return {"success": True, "result": f"MOCKED: Email would be sent to {to_email}"}
     
     try:
@@ -55,40 +212,68 @@ def _send_gmail(to_email: str, subject: str, body: str) -> Dict[str, Any]:
                 "body": body
             },
         )
-        logging.info(f"✅ Email sent successfully to {to_email}")
+        logger.info("✅ Email sent successfully to %s", to_email)
         return {"success": True, "result": result}
     except Exception as e:
-        logging.error(f"❌ Gmail send error to {to_email}: {e}")
+        logger.error("❌ Gmail send error to %s: %s", to_email, e)
         return {"success": False, "error": str(e)}
 
-def _extract_text_from_upload(filename: str, data: bytes) -> str:
-    """Extract text from uploaded file based on file extension."""
+async def _send_gmail_async(composio, to_email: str, subject: str, body: str) -> Dict[str, Any]:
+    """Run the blocking Gmail send in a worker thread so the event loop stays free."""
+    return await asyncio.to_thread(_send_gmail, composio, to_email, subject, body)
+
+async def _send_gmail_batch(composio, messages: Dict[str, Tuple[str, str, str]]) -> Dict[str, Dict[str, Any]]:
+    """Send several (to, subject, body) emails in one concurrent round and key results by name."""
+    results = await asyncio.gather(
+        *(_send_gmail_async(composio, *message) for message in messages.values()),
+        return_exceptions=True,
+    )
+    return {
+        key: {"success": False, "error": str(res)} if isinstance(res, Exception) else res
+        for key, res in zip(messages, results)
+    }
+
+def _extract_pdf(path: str) -> str:
+    with open(path, "rb") as fp:
+        return extract_text(fp)
+
+def _extract_docx(path: str) -> str:
+    doc = Document(path)
+    paragraphs = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
+    return "\n".join(paragraphs)
+
+def _extract_plain(path: str) -> str:
+    with open(path, "r", encoding="utf-8", errors="ignore") as fp:
+        return fp.read(MAX_RESUME_CHARS)
+
+# Extension -> extractor; anything else is rejected at upload time
+_EXTRACTORS = {
+    ".pdf": _extract_pdf,
+    ".docx": _extract_docx,
+    ".txt": _extract_plain,
+    ".md": _extract_plain,
+}
+
+def _extract_text_from_upload(filename: str, path: str) -> str:
+    """Extract text from an uploaded file on disk based on file extension."""
     if not filename:
         return ""
     
-    name = filename.lower()
+    ext = os.path.splitext(filename)[1].lower()
     try:
-        if name.endswith(".pdf"):
-            with io.BytesIO(data) as fp:
-                text = extract_text(fp)
-                return text.strip()
-        elif name.endswith(".docx"):
-            with io.BytesIO(data) as fp:
-                doc = Document(fp)
-                paragraphs = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
-                return "\n".join(paragraphs)
-        elif name.endswith((".txt", ".md")):
-            return data.decode("utf-8", errors="ignore").strip()
-        else:
-            # Try to decode as text for other formats
-            return data.decode("utf-8", errors="ignore").strip()
+        text = _EXTRACTORS[ext](path)
+        return text.strip()[:MAX_RESUME_CHARS]
     except Exception as e:
-        logging.error(f"Error extracting text from {filename}: {e}")
+        logger.error("Error extracting text from %s: %s", filename, e)
         return f"Error reading file: {str(e)}"
 
 class InterviewMCP:
+    def __init__(self):
+        # Set by the app lifespan
+        self.composio = None
+
     async def initialize(self, _params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
-        logging.info("🔧 MCP Server initializing...")
+        logger.info("🔧 MCP Server initializing...")
         return {
             "protocolVersion": "0.1.0", 
             "serverInfo": {
@@ -135,13 +320,13 @@ class InterviewMCP:
             if not room:
                 raise ValueError("room_name is required")
             
-            context = room_context.get(room)
+            context = await room_context.get(room)
             if not context:
-                logging.warning(f"❌ No context found for room: {room}")
+                logger.warning("❌ No context found for room: %s", room)
                 return None
             
-            logging.info(f"✅ Retrieved context for room: {room} (candidate: {context.get('name')})")
-            return context
+            logger.info("✅ Retrieved context for room: %s (candidate: %s)", room, context.get('name'))
+            return {**context, "resume_text": _decompress_resume(context.get("resume_text", b""))}
 
         elif name == "finish_and_email_transcript":
             room = arguments.get("room_name")
@@ -152,14 +337,14 @@ class InterviewMCP:
             if not room:
                 raise ValueError("room_name is required")
             
-            context = room_context.get(room, {})
+            context = await room_context.get(room) or {}
             candidate_email = context.get("email")
             candidate_name = context.get("name", "Candidate")
             hr_email = context.get("hr_email") or HR_EMAIL
             job_title = context.get("job_title", "Position")
             
             if not candidate_email:
-                logging.error(f"❌ No candidate email found for room: {room}")
+                logger.error("❌ No candidate email found for room: %s", room)
                 return {"success": False, "error": "Candidate email not found"}
 
             timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
@@ -218,23 +403,20 @@ Room: {room}
 {formatted_transcript}
 
 === CANDIDATE RESUME ===
-{context.get('resume_text', 'Resume not available')}
+{_decompress_resume(context.get('resume_text', b'')) or 'Resume not available'}
 
 ---
 Automatically generated by AI Interviewer System
 """
 
-            # Send emails
-            email_results = {}
-            
-            if candidate_email:
-                candidate_result = _send_gmail(candidate_email, subject_candidate, body_candidate)
-                email_results["candidate"] = candidate_result
-                
-            hr_result = _send_gmail(hr_email, subject_hr, body_hr)
-            email_results["hr"] = hr_result
-
-            logging.info(f"✅ Interview completed for {candidate_name}, emails dispatched")
+            # Bodies differ (HR gets notes and the resume), so these stay two sends,
+            # dispatched together so the finalize step costs one round-trip
+            email_results = await _send_gmail_batch(self.composio, {
+                "candidate": (candidate_email, subject_candidate, body_candidate),
+                "hr": (hr_email, subject_hr, body_hr),
+            })
+
+            logger.info("✅ Interview completed for %s, emails dispatched", candidate_name)
             return {
                 "success": True, 
                 "room_name": room,
@@ -246,7 +428,85 @@ Automatically generated by AI Interviewer System
             raise ValueError(f"Unknown tool: {name}")
 
 server_impl = InterviewMCP()
-app = FastAPI(title="AI Interviewer MCP Server", version="1.0.0")
+
+def _json_response(content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """JSON response encoded with orjson, for the hot MCP path."""
+    return Response(
+        content=orjson.dumps(content),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+
+class _BodyTooLarge(HTTPException):
+    # An HTTPException so FastAPI's body parsing re-raises it as-is instead of turning it into a 400
+    def __init__(self):
+        super().__init__(status_code=413, detail="Request body too large")
+
+class MaxBodySizeMiddleware:
+    """Reject request bodies over max_bytes with 413 before they are fully received."""
+
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        declared = dict(scope["headers"]).get(b"content-length")
+        if declared and declared.isdigit() and int(declared) > self.max_bytes:
+            await _json_response({"detail": "Request body too large"}, status_code=413)(scope, receive, send)
+            return
+
+        # Chunked bodies carry no Content-Length, so also count what arrives
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise _BodyTooLarge()
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _BodyTooLarge:
+            if not response_started:
+                await _json_response({"detail": "Request body too large"}, status_code=413)(scope, receive, send)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One Composio client for the life of the process
+    app.state.composio = _init_composio()
+    server_impl.composio = app.state.composio
+    try:
+        yield
+    finally:
+        try:
+            _reset_pdf_pool()
+        except Exception as e:
+            logger.error("❌ Error shutting down resume parser pool: %s", e)
+        await room_context.close()
+
+app = FastAPI(
+    title="AI Interviewer MCP Server",
+    version="1.0.0",
+    lifespan=lifespan,
+)
+
+# Added before CORS so CORS stays outermost and 413s still carry CORS headers
+app.add_middleware(MaxBodySizeMiddleware, max_bytes=MAX_REQUEST_BYTES)
 
 # Configure CORS
 origins = ["*"] if ALLOW_ORIGINS == "*" else ALLOW_ORIGINS.split(",")
@@ -260,27 +520,26 @@ app.add_middleware(
 
 @app.get("/")
 async def root():
-    return {"message": "AI Interviewer MCP Server", "active_rooms": len(room_context)}
+    return {"message": "AI Interviewer MCP Server", "active_rooms": await room_context.count()}
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     return {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
-        "active_interviews": len(room_context),
-        "composio_configured": composio is not None
+        "active_interviews": await room_context.count(),
+        "composio_configured": request.app.state.composio is not None
     }
 
-@app.post("/mcp")
-async def mcp_endpoint(request: Request):
+async def _dispatch_rpc(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a single JSON-RPC request and build its response object."""
+    req_id = payload.get("id") if isinstance(payload, dict) else None
     try:
-        payload = await request.json()
         method = payload.get("method")
         params = payload.get("params")
-        req_id = payload.get("id")
-        
-        logging.info(f"🔧 MCP Request: {method}")
-        
+
+        logger.debug("🔧 MCP Request: %s", method)
+
         if method == "initialize":
             result = await server_impl.initialize(params)
         elif method == "list_tools":
@@ -289,56 +548,111 @@ async def mcp_endpoint(request: Request):
             result = await server_impl.call_tool(params or {})
         else:
             raise ValueError(f"Method not found: {method}")
-            
-        return JSONResponse(content={
-            "jsonrpc": "2.0", 
-            "id": req_id, 
+
+        return {
+            "jsonrpc": "2.0",
+            "id": req_id,
             "result": result
-        })
-        
+        }
+
     except Exception as e:
-        logging.error(f"❌ Error processing MCP request: {e}", exc_info=True)
-        return JSONResponse(
-            status_code=500,
-            content={
-                "jsonrpc": "2.0", 
-                "id": req_id, 
-                "error": {
-                    "code": -32603, 
-                    "message": str(e)
-                }
+        logger.error("❌ Error processing MCP request: %s", e, exc_info=True)
+        return {
+            "jsonrpc": "2.0",
+            "id": req_id,
+            "error": {
+                "code": -32603,
+                "message": str(e)
             }
+        }
+
+@app.post("/mcp")
+async def mcp_endpoint(request: Request):
+    try:
+        payload = orjson.loads(await request.body())
+    except HTTPException:
+        # e.g. 413 from MaxBodySizeMiddleware on an oversized chunked body
+        raise
+    except Exception as e:
+        logger.error("❌ Invalid MCP payload: %s", e)
+        return _json_response(
+            status_code=400,
+            content={"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}}
         )
 
+    # JSON-RPC batch: dispatch every call concurrently, one response array
+    if isinstance(payload, list):
+        if not payload:
+            return _json_response(
+                status_code=400,
+                content={"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid Request"}}
+            )
+        responses = await asyncio.gather(*(_dispatch_rpc(item) for item in payload))
+        return _json_response(content=list(responses))
+
+    response = await _dispatch_rpc(payload)
+    return _json_response(status_code=500 if "error" in response else 200, content=response)
+
 # ---------- HTTP helpers for the frontend ----------
 
+def _context_summary(context: Dict[str, Any]) -> Dict[str, Any]:
+    """Sanitized view of a room context (without full resume text for brevity)."""
+    return {
+        "room_name": context.get("room_name"),
+        "candidate": context.get("name"),
+        "email": context.get("email"),
+        "job_title": context.get("job_title"),
+        "has_resume": bool(context.get("resume_text")),
+        "created_at": context.get("created_at")
+    }
+
 @app.post("/upload")
 async def upload_resume(file: UploadFile = File(...)):
     """Upload and extract text from resume file."""
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
+    if os.path.splitext(file.filename)[1].lower() not in _EXTRACTORS:
+        raise HTTPException(status_code=415, detail="Unsupported file type")
     
+    tmp_path = None
     try:
-        data = await file.read()
-        if len(data) == 0:
+        # Copy the upload to a named temp file (off the event loop) so the
+        # worker process can read it by path instead of receiving the bytes.
+        with tempfile.NamedTemporaryFile(delete=False) as tmp:
+            tmp_path = tmp.name
+            await run_in_threadpool(shutil.copyfileobj, file.file, tmp, UPLOAD_CHUNK_SIZE)
+            size = tmp.tell()
+        if size == 0:
             raise HTTPException(status_code=400, detail="Empty file")
         
-        text = _extract_text_from_upload(file.filename, data)
+        loop = asyncio.get_running_loop()
+        try:
+            text = await loop.run_in_executor(_get_pdf_pool(), _extract_text_from_upload, file.filename, tmp_path)
+        except BrokenProcessPool:
+            logger.error("❌ Resume parser worker died on %s; rebuilding pool", file.filename)
+            _reset_pdf_pool()
+            raise
         
         if not text.strip():
             raise HTTPException(status_code=400, detail="Could not extract text from file")
         
-        logging.info(f"✅ Resume uploaded: {file.filename} ({len(text)} chars)")
+        logger.info("✅ Resume uploaded: %s (%s chars)", file.filename, len(text))
         return {
             "ok": True, 
-            "text": text[:200000],  # Limit to 200k chars
+            "text": text,  # Already capped at MAX_RESUME_CHARS
             "filename": file.filename,
-            "size": len(data)
+            "size": size
         }
         
     except Exception as e:
-        logging.error(f"❌ Resume upload error: {e}")
+        logger.error("❌ Resume upload error: %s", e)
         raise HTTPException(status_code=500, detail=f"File processing error: {str(e)}")
+    finally:
+        if tmp_path:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
 
 @app.post("/context")
 async def set_context(
@@ -356,19 +670,20 @@ async def set_context(
         raise HTTPException(status_code=400, detail="roomName, name, and email are required")
     
     try:
-        room_context[roomName] = {
+        context = {
             "room_name": roomName,
             "name": name,
             "email": email,
             "phone": phone,
             "job_title": jobTitle,
             "job_description": jobDescription,
-            "resume_text": resumeText,
+            "resume_text": _compress_resume(resumeText[:MAX_RESUME_CHARS]),
             "hr_email": hrEmail,
             "created_at": datetime.utcnow().isoformat(),
         }
+        await room_context.set(roomName, context)
         
-        logging.info(f"✅ Context set for room: {roomName} (candidate: {name})")
+        logger.info("✅ Context set for room: %s (candidate: %s)", roomName, name)
         return {
             "ok": True, 
             "roomName": roomName,
@@ -377,31 +692,30 @@ async def set_context(
         }
         
     except Exception as e:
-        logging.error(f"❌ Error setting context: {e}")
+        logger.error("❌ Error setting context: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to save context: {str(e)}")
 
 @app.get("/context/{room_name}")
-async def get_context(room_name: str):
+async def get_context(room_name: str, request: Request):
     """Get interview context for debugging purposes."""
-    context = room_context.get(room_name)
+    context = await room_context.get(room_name)
     if not context:
         raise HTTPException(status_code=404, detail="Room context not found")
     
-    # Return sanitized version (without full resume text for brevity)
-    return {
-        "room_name": context.get("room_name"),
-        "candidate": context.get("name"),
-        "email": context.get("email"),
-        "job_title": context.get("job_title"),
-        "has_resume": bool(context.get("resume_text")),
-        "created_at": context.get("created_at")
-    }
+    # Derived from the stored context on each request, so every worker agrees and a
+    # /context POST invalidates it without keeping ETag state next to the payload
+    summary = _context_summary(context)
+    summary_etag = etag(summary)
+    if etag_matches(request.headers.get("if-none-match"), summary_etag):
+        return Response(status_code=304, headers={"ETag": summary_etag})
+    return _json_response(content=summary, headers={"ETag": summary_etag})
 
 @app.get("/rooms")
 async def list_rooms():
     """List all active interview rooms."""
+    items = await room_context.items()
     return {
-        "active_rooms": len(room_context),
+        "active_rooms": len(items),
         "rooms": [
             {
                 "room_name": room,
@@ -409,7 +723,7 @@ async def list_rooms():
                 "job_title": data.get("job_title"),
                 "created_at": data.get("created_at")
             }
-            for room, data in room_context.items()
+            for room, data in items
         ]
     }
 
@@ -417,5 +731,5 @@ async def list_rooms():
 
 if __name__ == "__main__":
     import uvicorn
-    logging.info(f"🚀 Starting MCP Server on port {MCP_PORT}")
+    logger.info("🚀 Starting MCP Server on port %s", MCP_PORT)
     uvicorn.run("mcp_server:app", host="0.0.0.0", port=MCP_PORT, reload=True)
@@ -0,0 +1,28 @@
+import pytest
+
+import mcp_server
+
+
+def test_reset_pdf_pool_shuts_down_live_pool():
+    pool = mcp_server._get_pdf_pool()
+    mcp_server._reset_pdf_pool()
+
+    assert mcp_server._pdf_pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(len, "")
+
+
+def test_get_pdf_pool_rebuilds_after_reset():
+    first = mcp_server._get_pdf_pool()
+    mcp_server._reset_pdf_pool()
+    second = mcp_server._get_pdf_pool()
+
+    assert second is not first
+    mcp_server._reset_pdf_pool()
+
+
+def test_reset_pdf_pool_without_pool_is_noop():
+    mcp_server._reset_pdf_pool()
+    mcp_server._reset_pdf_pool()
+
+    assert mcp_server._pdf_pool is None
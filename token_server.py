@@ -1,10 +1,13 @@
-from flask import Flask, jsonify, request
-from flask_cors import CORS
+from fastapi import FastAPI, Query, Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.middleware.cors import CORSMiddleware
 from livekit import api
 import os
 import json
 from dotenv import load_dotenv
 
+from http_cache import etag, etag_matches
+
 load_dotenv()
 
 LIVEKIT_API_KEY = os.getenv("LIVEKIT_API_KEY")
@@ -13,18 +16,47 @@ LIVEKIT_URL = os.getenv("LIVEKIT_URL")
 PORT = int(os.getenv("PORT", 5000))
 CORS_ORIGIN = os.getenv("CORS_ORIGIN", "http://localhost:5173")
 
-app = Flask(__name__)
-CORS(app)
+LIVEKIT_CONFIGURED = bool(LIVEKIT_API_KEY and LIVEKIT_API_SECRET)
 
-def load_job_data():
-    """Load job data from JSON file"""
+def _issue_token(identity: str, room: str) -> str:
+    """Sign a room-join token for a participant"""
+    return (
+        api.AccessToken(LIVEKIT_API_KEY, LIVEKIT_API_SECRET)
+        .with_identity(identity)
+        .with_grants(api.VideoGrants(room_join=True, room=room))
+        .to_jwt()
+    )
+
+app = FastAPI(title="LiveKit Token Server")
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# job_data.json lives next to this script
+JOB_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'job_data.json')
+
+# Parsed job data as one (mtime, data, etag) tuple, reloaded only when the
+# file's mtime changes. Always replaced as a whole so concurrent /job requests
+# (run on the threadpool) never pair a body with another version's ETag.
+_job_cache = None
+
+def _load_job_entry():
+    """Load job data from JSON file as (data, etag); etag is None for fallback data"""
+    global _job_cache
     try:
-        # Get the directory where the script is located
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        json_path = os.path.join(script_dir, 'job_data.json')
+        st = os.stat(JOB_DATA_PATH)
+        entry = _job_cache
+        if entry is not None and entry[0] == st.st_mtime:
+            return entry[1], entry[2]
         
-        with open(json_path, 'r', encoding='utf-8') as file:
-            return json.load(file)
+        with open(JOB_DATA_PATH, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        entry = (st.st_mtime, data, etag(data))
+        _job_cache = entry
+        return entry[1], entry[2]
     except FileNotFoundError:
         print("Warning: job_data.json not found. Using fallback data.")
         return {
@@ -34,7 +66,7 @@ def load_job_data():
             "location": "Remote",
             "experience_level": "Mid-level",
             "employment_type": "Full-time"
-        }
+        }, None
     except json.JSONDecodeError as e:
         print(f"Error parsing job_data.json: {e}")
         return {
@@ -44,7 +76,7 @@ def load_job_data():
             "location": "TBD",
             "experience_level": "Various",
             "employment_type": "Full-time"
-        }
+        }, None
     except Exception as e:
         print(f"Unexpected error loading job data: {e}")
         return {
@@ -54,44 +86,46 @@ def load_job_data():
             "location": "TBD",
             "experience_level": "Various",
             "employment_type": "Full-time"
-        }
+        }, None
 
-@app.route("/health", methods=["GET"])
-def health():
-    return jsonify({"ok": True, "server": "livekit-token-python"})
+def load_job_data():
+    """Load job data from JSON file"""
+    return _load_job_entry()[0]
 
-@app.route("/token", methods=["GET"])
-def get_token():
-    room_name = request.args.get("roomName")
-    participant_name = request.args.get("participantName")
+@app.get("/health")
+async def health():
+    return {"ok": True, "server": "livekit-token-python"}
 
+@app.get("/token")
+async def get_token(
+    room_name: str = Query("", alias="roomName"),
+    participant_name: str = Query("", alias="participantName"),
+):
     if not room_name or not participant_name:
-        return jsonify({"error": "roomName and participantName are required"}), 400
-    if not LIVEKIT_API_KEY or not LIVEKIT_API_SECRET:
-        return jsonify({"error": "Server missing LiveKit credentials"}), 500
+        return JSONResponse(status_code=400, content={"error": "roomName and participantName are required"})
+    if not LIVEKIT_CONFIGURED:
+        return JSONResponse(status_code=500, content={"error": "Server missing LiveKit credentials"})
 
-    # Build token
-    token = (
-        api.AccessToken(LIVEKIT_API_KEY, LIVEKIT_API_SECRET)
-        .with_identity(participant_name)
-        .with_grants(api.VideoGrants(room_join=True, room=room_name))
-        .to_jwt()
-    )
+    token = _issue_token(participant_name, room_name)
 
-    return jsonify({"token": token, "url": LIVEKIT_URL})
+    return {"token": token, "url": LIVEKIT_URL}
 
-@app.route("/job", methods=["GET"])
-def get_job():
+# Plain def: FastAPI runs these in its threadpool, keeping file IO off the event loop
+@app.get("/job")
+def get_job(request: Request):
     """Get job title and description from JSON file"""
     try:
-        job_data = load_job_data()
-        return jsonify({
+        # Fallback data (file missing/invalid) is never cached, so it gets no ETag
+        job_data, job_etag = _load_job_entry()
+        if job_etag and etag_matches(request.headers.get("if-none-match"), job_etag):
+            return Response(status_code=304, headers={"ETag": job_etag})
+        return JSONResponse(content={
             "ok": True,
             "job": job_data
-        })
+        }, headers={"ETag": job_etag} if job_etag else None)
     except Exception as e:
         print(f"Error in /job endpoint: {e}")
-        return jsonify({
+        return JSONResponse(status_code=500, content={
             "ok": False,
             "error": "Failed to load job data",
             "job": {
@@ -100,24 +134,26 @@ def get_job():
                 "department": "Various",
                 "location": "TBD"
             }
-        }), 500
+        })
 
-@app.route("/job/reload", methods=["POST"])
+@app.post("/job/reload")
 def reload_job():
     """Reload job data from JSON file (useful for updates without server restart)"""
+    global _job_cache
     try:
+        _job_cache = None
         job_data = load_job_data()
-        return jsonify({
+        return {
             "ok": True,
             "message": "Job data reloaded successfully",
             "job": job_data
-        })
+        }
     except Exception as e:
         print(f"Error reloading job data: {e}")
-        return jsonify({
+        return JSONResponse(status_code=500, content={
             "ok": False,
             "error": "Failed to reload job data"
-        }), 500
+        })
 
 if __name__ == "__main__":
     # Load job data on startup to verify JSON file
@@ -125,4 +161,5 @@ if __name__ == "__main__":
     job_data = load_job_data()
     print(f"Loaded job: {job_data['title']} - {job_data['department']}")
     
-    app.run(host="0.0.0.0", port=PORT, debug=True)
\ No newline at end of file
+    import uvicorn
+    uvicorn.run("token_server:app", host="0.0.0.0", port=PORT, workers=int(os.getenv("WORKERS", "1")))